@@ -1,23 +1,33 @@
 import asyncio
-from playwright.async_api import async_playwright
+from playwright.async_api import async_playwright, Page, TimeoutError as PlaywrightTimeoutError
 import os
 from dotenv import load_dotenv
-from datetime import datetime
 from sqlalchemy import select, func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from models import init_db, Connection, ScrapingHistory
-from playwright.sync_api import sync_playwright
-import json
-from typing import Dict, List
 import random
+import re
+import sys
 from persistent_browser import PersistentBrowser
-from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError
-import time
 # Load environment variables
 load_dotenv(override=True)
 
 # Initialize database session
 Session = init_db()
 
+# Number of search result pages scraped concurrently
+SCRAPE_CONCURRENCY = 5
+# LinkedIn people search shows 10 results per page
+RESULTS_PER_PAGE = 10
+
+# Saved storage state so warm starts skip the cookie round-trip
+STORAGE_STATE_PATH = 'browser_state.json'
+
+# Matches the connection ID inside a connectionOf search href
+_CONN_ID_RE = re.compile(r'connectionOf=%5B%22(.*?)%22%5D')
+# Matches a (possibly comma-grouped) count like "1,704"
+_DIGITS_RE = re.compile(r'\d[\d,]*')
+
 async def set_cookie_session(context):
     """Set cookie session from environment variable"""
     try:
@@ -37,52 +47,172 @@ async def set_cookie_session(context):
         print(f"Error setting cookie session: {str(e)}")
         return False
 
-def save_single_connection(connection_data, source_profile):
-    """Save or update a single connection in the database"""
-    session = Session()
+# Resource types the text scrape never needs
+_BLOCKED_RESOURCE_TYPES = {"image", "font", "media", "stylesheet"}
+
+async def _block_noncritical(route):
+    """Abort image/font/media/tracking requests, pass everything else"""
+    request = route.request
+    if (request.resource_type in _BLOCKED_RESOURCE_TYPES
+            or "ads" in request.url or "analytics" in request.url):
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def new_logged_in_context(browser):
+    """Create a browser context that is already logged in
+
+    Warm starts reuse the saved storage state; only the first run sets
+    the li_at cookie from the environment and saves the state for next
+    time. Returns None when no cookie could be set.
+    """
+    if os.path.exists(STORAGE_STATE_PATH):
+        context = await browser.new_context(storage_state=STORAGE_STATE_PATH)
+    else:
+        context = await browser.new_context()
+        if not await set_cookie_session(context):
+            await context.close()
+            return None
+        await context.storage_state(path=STORAGE_STATE_PATH)
+
+    # Drop the page weight that only matters visually; documents,
+    # scripts and XHR still go through
+    await context.route("**/*", _block_noncritical)
+    return context
+
+def save_connections_batch(session, rows, source_profile, refresh=False):
+    """Save a batch of connections, insert-only by default
+
+    Steady-state runs take the cheapest SQLite path: one multi-VALUES
+    INSERT ... ON CONFLICT DO NOTHING, leaving rows that already exist
+    untouched (their occupation may go stale between runs). With
+    refresh=True existing rows are also brought up to date through the
+    bulk-update path. The caller owns the session and its transaction;
+    nothing is committed here. Returns (new, existing) counts.
+    """
+    if not rows:
+        return 0, 0
+
     try:
-        # Try to find existing connection
-        existing = session.query(Connection).filter_by(
-            profile_url=connection_data['profile_url']
-        ).first()
-        
-        if existing:
-            # Update existing connection
-            existing.name = connection_data['name']
-            existing.occupation = connection_data['occupation']
-            existing.source_profile = source_profile
-            print(f"Updated existing connection: {connection_data['name']}")
-        else:
-            # Create new connection
-            new_connection = Connection(
-                name=connection_data['name'],
-                occupation=connection_data['occupation'],
-                profile_url=connection_data['profile_url'],
-                source_profile=source_profile
-            )
-            session.add(new_connection)
-            print(f"Saved new connection: {connection_data['name']}")
-        
-        # Commit the change
-        session.commit()
-        return True
-    
+        if refresh:
+            # Single IN query instead of one existence check per row
+            urls = [row['profile_url'] for row in rows]
+            existing_ids = dict(session.execute(
+                select(Connection.profile_url, Connection.id)
+                .where(Connection.profile_url.in_(urls))
+            ).all())
+
+            new_rows = []
+            updated_rows = []
+            for row in rows:
+                mapped = {**row, 'source_profile': source_profile}
+                connection_id = existing_ids.get(row['profile_url'])
+                if connection_id is None:
+                    new_rows.append(mapped)
+                else:
+                    updated_rows.append({**mapped, 'id': connection_id})
+
+            if new_rows:
+                session.bulk_insert_mappings(Connection, new_rows)
+            if updated_rows:
+                session.bulk_update_mappings(Connection, updated_rows)
+
+            print(f"Saved batch of {len(rows)} connections "
+                  f"({len(new_rows)} new, {len(updated_rows)} updated)")
+            return len(new_rows), len(updated_rows)
+
+        stmt = sqlite_insert(Connection).values([
+            {**row, 'source_profile': source_profile} for row in rows
+        ]).on_conflict_do_nothing(index_elements=['profile_url'])
+        new_count = session.execute(stmt).rowcount
+
+        print(f"Saved batch of {len(rows)} connections "
+              f"({new_count} new, {len(rows) - new_count} already known)")
+        return new_count, len(rows) - new_count
+
     except Exception as e:
-        print(f"Error saving connection {connection_data['name']}: {str(e)}")
-        session.rollback()
-        return False
-    
-    finally:
-        session.close()
+        print(f"Error saving connections batch: {str(e)}")
+        return 0, 0
+
+def _search_page_url(search_url, page_number):
+    """Direct URL for the Nth search results page"""
+    return f"{search_url}&page={page_number}"
+
+async def scrape_search_page(browser, semaphore, session, search_url, page_number, source_profile, connections, seen_urls, refresh=False):
+    """Scrape one search results page in its own browser context
+
+    Contexts are cheap to create against a shared browser, so each page
+    gets a fresh one; the semaphore bounds how many run at a time.
+    Returns (new, updated, failed) counts for the page.
+    """
+    async with semaphore:
+        context = await new_logged_in_context(browser)
+        if not context:
+            return 0, 0, 0
+        try:
+            page = await context.new_page()
+
+            print(f"\nProcessing page {page_number}")
+            await page.goto(_search_page_url(search_url, page_number), wait_until='domcontentloaded', timeout=60000)
+
+            # Wait until result cards actually render instead of a fixed sleep
+            await page.wait_for_function(
+                "() => document.querySelectorAll('.reusable-search__result-container').length > 0"
+                " && !document.querySelector('.artdeco-loader')",
+                timeout=15000
+            )
+
+            # Extract every card's details in a single CDP call instead
+            # of three query_selector round-trips per card
+            rows = await page.eval_on_selector_all(
+                '.reusable-search__result-container',
+                """els => els.map(e => ({
+                    name: (e.querySelector('.entity-result__title-text')?.innerText || 'N/A')
+                        .replace('View profile for ', '').trim(),
+                    occupation: (e.querySelector('.entity-result__primary-subtitle')?.innerText || 'N/A').trim(),
+                    profile_url: (e.querySelector('.app-aware-link')?.href || 'N/A').split('?')[0]
+                }))"""
+            )
 
-async def get_profile_connections(page, profile_url):
+            if not rows:
+                print(f"No connection elements found on page {page_number}")
+                return 0, 0, 0
+
+            print(f"Found {len(rows)} connections on page {page_number}")
+
+            page_rows = []
+            for connection in rows:
+                # Set lookup instead of an O(N) scan over the list of dicts
+                if connection['profile_url'] in seen_urls or connection['name'] == "N/A":
+                    continue
+                seen_urls.add(connection['profile_url'])
+                connections.append(connection)
+                page_rows.append(connection)
+
+            # Flush the whole page in one statement instead of per row
+            new_count, updated_count = save_connections_batch(session, page_rows, source_profile, refresh=refresh)
+            return new_count, updated_count, len(page_rows) - new_count - updated_count
+
+        except Exception as e:
+            print(f"Error processing page {page_number}: {str(e)}")
+            return 0, 0, 0
+
+        finally:
+            await context.close()
+
+async def get_profile_connections(browser, page, profile_url, refresh=False):
     """Scrape connections from a specific LinkedIn profile"""
+    source_profile = profile_url
     print(f"Navigating to profile: {profile_url}")
     try:
         # First navigate to the profile
         await page.goto(profile_url, wait_until='domcontentloaded', timeout=60000)
         await page.wait_for_selector('body', timeout=10000)
-        await page.wait_for_timeout(3000)
+        # Wait for the connections link to render rather than a fixed 3s
+        try:
+            await page.wait_for_selector('a[href*="connectionOf"]', timeout=10000)
+        except PlaywrightTimeoutError:
+            pass
         
         # Look for connections count using multiple possible selectors
         connection_selectors = [
@@ -102,7 +232,8 @@ async def get_profile_connections(page, profile_url):
                     connections_element = element
                     count_text = await element.inner_text()
                     # Extract number from text (e.g., "425" from "425 connections")
-                    connections_count = int(''.join(filter(str.isdigit, count_text)))
+                    count_match = _DIGITS_RE.search(count_text)
+                    connections_count = int(count_match.group(0).replace(',', '')) if count_match else 0
                     
                     # Get the connection ID from the parent anchor href
                     parent_anchor = await element.evaluate('node => node.closest("a")')
@@ -110,8 +241,7 @@ async def get_profile_connections(page, profile_url):
                         href = await parent_anchor.get_attribute('href')
                         if 'connectionOf' in href:
                             # Extract the connection ID from the URL
-                            import re
-                            match = re.search(r'connectionOf=%5B%22(.*?)%22%5D', href)
+                            match = _CONN_ID_RE.search(href)
                             if match:
                                 connection_id = match.group(1)
                     
@@ -123,130 +253,72 @@ async def get_profile_connections(page, profile_url):
         
         if not connections_element or not connection_id:
             print("Could not find connections count or ID. The profile might be private.")
-            return []
+            return [], 0
         
         # Construct the search URL with the connection ID
         search_url = f"https://www.linkedin.com/search/results/people/?connectionOf=%5B%22{connection_id}%22%5D&network=%5B%22F%22%2C%22S%22%5D&origin=MEMBER_PROFILE_CANNED_SEARCH"
-        print(f"Navigating to search results: {search_url}")
-        
-        await page.goto(search_url, wait_until='domcontentloaded', timeout=60000)
-        await page.wait_for_selector('.search-results-container', timeout=10000)
-        
+        print(f"Search results URL: {search_url}")
+
     except Exception as e:
         print(f"Navigation error: {str(e)}")
-        return []
-    
-    connections = []
-    total_saved = 0
-    failed_saves = 0
-    current_page = 1
+        return [], 0
     
+    total_pages = (connections_count + RESULTS_PER_PAGE - 1) // RESULTS_PER_PAGE
+
     print("\nStarting to extract connections...")
-    print(f"Expected total connections: {connections_count}")
-    
-    while total_saved < connections_count:
-        try:
-            print(f"\nProcessing page {current_page}")
-            
-            # Wait for the search results to load
-            await page.wait_for_selector('.search-results-container', timeout=10000)
-            await page.wait_for_timeout(2000)
-            
-            # Get all connection elements on the current page
-            connection_elements = await page.query_selector_all('.reusable-search__result-container')
-            
-            if not connection_elements:
-                print("No connection elements found on this page")
-                break
-            
-            print(f"Found {len(connection_elements)} connections on page {current_page}")
-            
-            for element in connection_elements:
-                try:
-                    # Extract connection details
-                    name = await element.query_selector('.entity-result__title-text')
-                    name_text = await name.inner_text() if name else "N/A"
-                    name_text = name_text.replace('View profile for ', '').strip()  # Clean up the name
-                    
-                    occupation = await element.query_selector('.entity-result__primary-subtitle')
-                    occupation_text = await occupation.inner_text() if occupation else "N/A"
-                    
-                    profile_link = await element.query_selector('.app-aware-link')
-                    profile_url = await profile_link.get_attribute('href') if profile_link else "N/A"
-                    
-                    if profile_url != "N/A":
-                        profile_url = profile_url.split('?')[0]
-                    
-                    connection = {
-                        'name': name_text.strip(),
-                        'occupation': occupation_text.strip(),
-                        'profile_url': profile_url
-                    }
-                    
-                    if connection not in connections and connection['name'] != "N/A":
-                        connections.append(connection)
-                        if save_single_connection(connection, profile_url):
-                            total_saved += 1
-                            print(f"Progress: {total_saved}/{connections_count} connections saved")
-                        else:
-                            failed_saves += 1
-                
-                except Exception as e:
-                    print(f"Error processing connection: {str(e)}")
-                    continue
-            
-            # Check for next page button
-            next_button = await page.query_selector('button[aria-label="Next"]')
-            if not next_button:
-                print("No more pages available")
-                break
-            
-            # Check if next button is disabled
-            is_disabled = await next_button.get_attribute('disabled')
-            if is_disabled:
-                print("Reached last page")
-                break
-            
-            # Click next page and wait for navigation
-            await next_button.click()
-            await page.wait_for_timeout(2000)  # Wait for page transition
-            current_page += 1
-            
-        except Exception as e:
-            print(f"Error processing page {current_page}: {str(e)}")
-            break
-    
+    print(f"Expected total connections: {connections_count} across {total_pages} pages")
+
+    connections = []
+    seen_urls = set()
+    semaphore = asyncio.Semaphore(SCRAPE_CONCURRENCY)
+
+    # One session and one transaction for the whole scrape; pages are
+    # flushed as they arrive and everything commits on scope exit
+    with Session() as session, session.begin():
+        results = await asyncio.gather(*[
+            scrape_search_page(browser, semaphore, session, search_url,
+                               page_number, source_profile, connections, seen_urls,
+                               refresh=refresh)
+            for page_number in range(1, total_pages + 1)
+        ])
+
+    new_total = sum(new for new, _, _ in results)
+    updated_total = sum(updated for _, updated, _ in results)
+    failed_saves = sum(failed for _, _, failed in results)
+    total_saved = new_total + updated_total
+
     print(f"\nFinished extracting. Total connections saved: {total_saved}/{connections_count}")
     if failed_saves > 0:
         print(f"Failed to save {failed_saves} connections")
-    
-    return connections
 
-def print_extraction_stats(profile_url):
-    """Print statistics about the extracted connections"""
+    return connections, new_total
+
+def print_extraction_stats(profile_url, new_connections):
+    """Print statistics about the extracted connections
+
+    The new-connection count comes from the scrape itself, so only the
+    overall total needs a query.
+    """
     session = Session()
     try:
-        # Get total connections from this profile
-        total_connections = session.query(Connection).filter_by(
-            source_profile=profile_url
-        ).count()
-        
-        # Get new connections added in this session
-        new_connections = session.query(Connection).filter(
-            Connection.source_profile == profile_url,
-            Connection.first_seen >= datetime.now().replace(second=0, microsecond=0)
-        ).count()
-        
+        # Get total connections from this profile; Core count avoids
+        # the legacy Query subquery and entity hydration overhead
+        total_connections = session.execute(
+            select(func.count())
+            .select_from(Connection)
+            .where(Connection.source_profile == profile_url)
+        ).scalar_one()
+
         print("\n=== Extraction Statistics ===")
         print(f"Profile: {profile_url}")
         print(f"Total connections extracted: {total_connections}")
         print(f"New connections added: {new_connections}")
         print("==========================\n")
-    
+
     finally:
         session.close()
 
-async def main():
+async def main(refresh=False):
     # Get profile URL from user
     profile_url = input("Enter the LinkedIn profile URL to extract connections from: ").strip()
     
@@ -260,17 +332,17 @@ async def main():
     
     async with async_playwright() as p:
         browser = await p.chromium.launch(headless=False)
-        context = await browser.new_context()
-        
-        if not await set_cookie_session(context):
+        context = await new_logged_in_context(browser)
+
+        if not context:
             print("Failed to set cookie session. Please check your .env file!")
             return
-        
+
         page = await context.new_page()
         
         try:
-            connections = await get_profile_connections(page, profile_url)
-            print_extraction_stats(profile_url)
+            connections, new_count = await get_profile_connections(browser, page, profile_url, refresh=refresh)
+            print_extraction_stats(profile_url, new_count)
             
         except Exception as e:
             print(f"An error occurred: {str(e)}")
@@ -279,105 +351,6 @@ async def main():
             await context.close()
             await browser.close()
 
-def extract_connection_info(page) -> List[Dict]:
-    connections = []
-    
-    # Wait for the connections list to load
-    page.wait_for_selector('ul.HhVStUlnpyqWXCvMFtgOOSXoXttneABVU')
-    
-    # Get all connection items
-    connection_items = page.query_selector_all('li.AdHMbgDGIMDafLgUlAYlroYNrSpshgCHY')
-    
-    for item in connection_items:
-        try:
-            # Extract name
-            name_element = item.query_selector('span.mkMastUmWkELhAcaaNYzKMdrjlCmJXnYgZE')
-            name = name_element.inner_text().strip() if name_element else "N/A"
-            
-            # Extract title
-            title_element = item.query_selector('div.mTjnOwtMxHPffEIRcJLDWXTPzwQcTgTqrfveo')
-            title = title_element.inner_text().strip() if title_element else "N/A"
-            
-            # Extract location
-            location_element = item.query_selector('div.bPSmFcwecOKZVgXSLAwwTDITpxNrJUrPIOE')
-            location = location_element.inner_text().strip() if location_element else "N/A"
-            
-            # Extract profile URL
-            profile_link = item.query_selector('a.dgePcUVTyZcmWIuOySyndWdGoBMukAZsio')
-            profile_url = profile_link.get_attribute('href') if profile_link else "N/A"
-            
-            connection = {
-                'name': name,
-                'title': title,
-                'location': location,
-                'profile_url': profile_url
-            }
-            connections.append(connection)
-            
-        except Exception as e:
-            print(f"Error extracting connection info: {str(e)}")
-            continue
-    
-    return connections
-
-def get_total_pages(page) -> int:
-    try:
-        # Look for pagination text that shows "Page 1 of X"
-        pagination_text = page.query_selector('div.artdeco-pagination__page-state')
-        if pagination_text:
-            text = pagination_text.inner_text()
-            return int(text.split('of')[-1].strip())
-    except Exception:
-        pass
-    return 1
-
-def extract_connections(page):
-    
-    
-    
-    page.goto('https://www.linkedin.com/mynetwork/invite-connect/connections/')
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context()
-        
-        # Load cookies if file exists
-        if os.path.exists(cookies_file):
-            with open(cookies_file, 'r') as f:
-                cookies = json.load(f)
-            context.add_cookies(cookies)
-        
-        page = context.new_page()
-        
-        # Navigate to connections page
-        page.wait_for_load_state('networkidle')
-        
-        all_connections = []
-        total_pages = get_total_pages(page)
-        
-        for page_num in range(1, total_pages + 1):
-            print(f"Processing page {page_num} of {total_pages}")
-            
-            # Extract connections from current page
-            connections = extract_connection_info(page)
-            all_connections.extend(connections)
-            
-            # Click next page button if not on last page
-            if page_num < total_pages:
-                next_button = page.query_selector('button.artdeco-pagination__button--next')
-                if next_button:
-                    next_button.click()
-                    page.wait_for_load_state('networkidle')
-        
-        # Save the results
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(all_connections, f, indent=2, ensure_ascii=False)
-        
-        print(f"Extracted {len(all_connections)} connections and saved to {output_file}")
-        
-        browser.close()
-
-
-
 class Scrapper(PersistentBrowser):
 
     def __init__(self):
@@ -386,12 +359,12 @@ class Scrapper(PersistentBrowser):
         
         self.main_url = "https://www.linkedin.com/"
 
-    def _random_delay(self, min_seconds: float = 2.0, max_seconds: float = 5.0):
-        """Add random delay to mimic human behavior"""
+    async def _random_delay(self, min_seconds: float = 2.0, max_seconds: float = 5.0):
+        """Add random delay to mimic human behavior without blocking the loop"""
         delay = random.uniform(min_seconds, max_seconds)
-        time.sleep(delay)
+        await asyncio.sleep(delay)
         
-    def _human_scroll(self, page: Page, scroll_distance: int = 300):
+    async def _human_scroll(self, page: Page, scroll_distance: int = 300):
         """Scroll like a human with variable speed and pauses"""
         current_position = 0
         target_position = scroll_distance
@@ -403,19 +376,19 @@ class Scrapper(PersistentBrowser):
             current_position = min(current_position + scroll_chunk, target_position)
             
             # Scroll with smooth behavior
-            page.evaluate(f"window.scrollTo({{top: {current_position}, behavior: 'smooth'}})")
+            await page.evaluate(f"window.scrollTo({{top: {current_position}, behavior: 'smooth'}})")
             
             # Random micro-pause between scrolls (0.1-0.3 seconds)
-            time.sleep(random.uniform(0.1, 0.3))
+            await asyncio.sleep(random.uniform(0.1, 0.3))
             
         # Pause at the end of scroll
-        self._random_delay(1.0, 2.0)
+        await self._random_delay(1.0, 2.0)
 
 
-    def human_like_behavior(self):
+    async def human_like_behavior(self):
         
         # Initialize variables for infinite scroll
-        last_height = self.page.evaluate('document.body.scrollHeight')
+        last_height = await self.page.evaluate('document.body.scrollHeight')
         all_loaded = False
         scroll_attempts = 0
         max_scroll_attempts = 20  # Limit scrolling to prevent infinite loops
@@ -423,13 +396,13 @@ class Scrapper(PersistentBrowser):
 
         while not all_loaded and scroll_attempts < max_scroll_attempts:
             # Scroll like a human
-            self._human_scroll(self.page, scroll_distance=random.randint(300, 500))
+            await self._human_scroll(self.page, scroll_distance=random.randint(300, 500))
             
             # Wait for possible new content to load
-            self._random_delay(1.0, 2.0)
+            await self._random_delay(1.0, 2.0)
             
             # Check if we've reached the bottom
-            new_height = self.page.evaluate('document.body.scrollHeight')
+            new_height = await self.page.evaluate('document.body.scrollHeight')
             if new_height == last_height:
                 scroll_attempts += 1
                 if scroll_attempts >= 3:  # If height hasn't changed for 3 attempts, assume all loaded
@@ -443,104 +416,93 @@ class Scrapper(PersistentBrowser):
                 self.save_state()
         
 
-    def load_connection_page_from_main(self):
+    async def load_connection_page_from_main(self):
                 
         # Navigate to the profile page
-        self.page.goto(self.main_url)
-        self._random_delay(3.0, 5.0)
+        await self.page.goto(self.main_url)
+        await self._random_delay(3.0, 5.0)
 
-        connections_button = self.page.wait_for_selector('a[href*="connectionOf"]', timeout=5000)
-        # if not connections_button:
-        #     raise PlaywrightTimeoutError("Could not find connections button - profile might be private or not connected")
-        
+        connections_button = await self.page.wait_for_selector('a[href*="connectionOf"]', timeout=5000)
 
         # Move mouse naturally to the button
-        connections_button.hover()
-        self._random_delay(0.5, 1.0)
-        connections_button.click()
+        await connections_button.hover()
+        await self._random_delay(0.5, 1.0)
+        await connections_button.click()
         
         # Wait for connections page to load
-        self._random_delay(2.0, 4.0)
+        await self._random_delay(2.0, 4.0)
         
-        self.human_like_behavior()
+        await self.human_like_behavior()
 
-        # try:
-            # Wait for the connections list to load
-        self.page.wait_for_selector('.search-results-container ul[role="list"]', timeout=10000)
+        # Wait for the connections list to load
+        await self.page.wait_for_selector('.search-results-container ul[role="list"]', timeout=10000)
 
-        # except Exception as e:
-        #     print(f"Error in connection extraction: {e}")
 
-
-    def load_connection_page_from_anywhere(self):
+    async def load_connection_page_from_anywhere(self):
             
         # Navigate to the profile page
 
-        self.page.goto('https://www.linkedin.com/mynetwork/invite-connect/connections/')
+        await self.page.goto('https://www.linkedin.com/mynetwork/invite-connect/connections/')
         
-        self.human_like_behavior()
-
-        # try:
-            # Wait for the connections list to load
-        self.page.wait_for_selector('.search-results-container ul[role="list"]', timeout=10000)
+        await self.human_like_behavior()
 
-        # except Exception as e:
-        #     print(f"Error in connection extraction: {e}")
+        # Wait for the connections list to load
+        await self.page.wait_for_selector('.search-results-container ul[role="list"]', timeout=10000)
 
 
-    def check_if_connection_page(self):
+    async def check_if_connection_page(self):
             
         # Navigate to the profile page
         
-        self.human_like_behavior()
+        await self.human_like_behavior()
 
         try:
             # Wait for the connections list to load
-            self.page.wait_for_selector('.search-results-container ul[role="list"]', timeout=10000)
+            await self.page.wait_for_selector('.search-results-container ul[role="list"]', timeout=10000)
 
         except Exception as e:
             print(f"Error in connection extraction: {e}")
-            self.page.reload()
+            await self.page.reload()
 
-            self.page.wait_for_selector('.search-results-container ul[role="list"]', timeout=10000)
+            await self.page.wait_for_selector('.search-results-container ul[role="list"]', timeout=10000)
 
 
     def extract_connection_count(self, text: str) -> int:
-        # Remove "Connections" text and clean the number
-        try:
-            # Example input: "1,704 Connections"
-            clean_number = text.split(" ")[0].replace(",", "")
-            return int(clean_number)
-        except (ValueError, IndexError):
-            return 0
+        # Example input: "1,704 Connections"
+        match = _DIGITS_RE.search(text)
+        return int(match.group(0).replace(',', '')) if match else 0
 
 
-    def get_connections(self):
+    async def get_connections(self):
         
         
         if self.page.url !=  "https://www.linkedin.com/mynetwork/invite-connect/connections/":
             if random.randint(1,100) % 3 == 0:
-                self.load_connection_page_from_anywhere()
+                await self.load_connection_page_from_anywhere()
             else:
-                self.load_connection_page_from_main()
-        
-        self.check_if_connection_page()
-
-        header_element = self.page.query_selector('div[componentkey="ConnectionsPage_ConnectionsListHeader"] p')
-        connections_count_text = header_element.inner_text() if header_element else "0 Connections"
-        
-        connections_elements = self.page.query_selector_all('div[data-view-name="connections-list"]')
-
-        for element in connections_elements:
-            
-            profile_elem = element.query_selector('a[href*="/in/"]:not([data-view-name="connections-profile"])')
-            title_elem = element.query_selector('p:not(:has(a))')
-
-            profile_url = profile_elem.get_attribute('href') 
-            name = profile_elem.inner_text().strip() 
-            title = title_elem.inner_text().strip() 
-
-            print(name)
+                await self.load_connection_page_from_main()
+        
+        await self.check_if_connection_page()
+
+        header_element = await self.page.query_selector('div[componentkey="ConnectionsPage_ConnectionsListHeader"] p')
+        connections_count_text = await header_element.inner_text() if header_element else "0 Connections"
+        
+        # Fetch every card's fields in one round-trip instead of three per card
+        rows = await self.page.eval_on_selector_all(
+            'div[data-view-name="connections-list"]',
+            """els => els.map(e => {
+                const profile = e.querySelector('a[href*="/in/"]:not([data-view-name="connections-profile"])');
+                const title = e.querySelector('p:not(:has(a))');
+                return {
+                    name: (profile?.innerText || 'N/A').trim(),
+                    title: (title?.innerText || 'N/A').trim(),
+                    profile_url: profile?.href || 'N/A'
+                };
+            })"""
+        )
+
+        for row in rows:
+            print(row['name'])
 
         connections_count = self.extract_connection_count(connections_count_text)
 
@@ -549,25 +511,23 @@ class Scrapper(PersistentBrowser):
 
 
 
-if __name__ == "__main__":
+async def run_scrapper():
     scraper = Scrapper()
     try:
-        scraper.start()
+        await scraper.start()
         # Replace with actual profile URL
-        connections = scraper.get_connections()
+        connections_count = await scraper.get_connections()
 
-        print(f"Found {len(connections)} connections")
+        print(f"Found {connections_count} connections")
     except Exception as e:
         print(f"An error occurred: {e}")
     finally:
-        scraper.close() 
+        await scraper.close()
 
-# if __name__ == "__main__":
-#     cookies_file = "linkedin_cookies.json"
-#     output_file = "connections.json"
-    
-#     if not os.path.exists(cookies_file):
-#         print(f"Error: Cookie file {cookies_file} not found!")
-#         exit(1)
-    
-#     extract_connections(cookies_file, output_file) 
\ No newline at end of file
+if __name__ == "__main__":
+    if "refresh-titles" in sys.argv:
+        # Re-scrape and bring names/occupations of known connections
+        # up to date instead of the insert-only fast path
+        asyncio.run(main(refresh=True))
+    else:
+        asyncio.run(run_scrapper())
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, func
+from sqlalchemy import create_engine, event, Column, Index, Integer, String, DateTime, func
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
@@ -9,11 +9,14 @@ Base = declarative_base()
 class Connection(Base):
     """Model for LinkedIn connections"""
     __tablename__ = 'connections'
+    # Covers the filtered counts in print_extraction_stats
+    __table_args__ = (Index('ix_conn_source_seen', 'source_profile', 'first_seen'),)
 
     id = Column(Integer, primary_key=True)
     name = Column(String, nullable=False)
     occupation = Column(String)
-    profile_url = Column(String, unique=True)
+    profile_url = Column(String, unique=True, index=True)
+    source_profile = Column(String)
     first_seen = Column(DateTime, default=func.now())
     last_updated = Column(DateTime, default=func.now(), onupdate=func.now())
 
@@ -29,6 +32,18 @@ class ScrapingHistory(Base):
 def init_db(db_url='sqlite:///linkedin_connections.db'):
     """Initialize database and return session maker"""
     engine = create_engine(db_url)
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Tune SQLite for write throughput on every new connection"""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-64000")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.close()
+
     Base.metadata.create_all(engine)
     Session = sessionmaker(bind=engine)
     return Session 
\ No newline at end of file
@@ -1,77 +1,94 @@
-from playwright.sync_api import sync_playwright, Browser, BrowserContext, Page
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page
 from typing import Optional
+import asyncio
 import os
 
 class PersistentBrowser:
-    def __init__(self, storage_state_path: str = "browser_state.json"):
+    def __init__(self, user_data_dir: str = "pw_profile", cdp_endpoint: Optional[str] = None):
         """
         Initialize the persistent browser manager.
-        
+
         Args:
-            storage_state_path (str): Path where browser state will be saved
+            user_data_dir (str): Directory holding the persistent browser profile
+            cdp_endpoint (str): Optional CDP URL of an already running Chromium
+                (e.g. "http://localhost:9222", launched with
+                --remote-debugging-port). When set, this instance attaches to
+                that browser with its own context instead of launching one, so
+                several scrapers can share a single Chromium. Defaults to the
+                LINKEDIN_CDP_ENDPOINT environment variable.
         """
-        self.storage_state_path = storage_state_path
+        self.user_data_dir = user_data_dir
+        self.cdp_endpoint = cdp_endpoint or os.getenv('LINKEDIN_CDP_ENDPOINT')
+        self.playwright = None
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
-        
-    def start(self) -> Page:
+
+    async def start(self) -> Page:
         """
         Start or restore a browser session.
-        
+
+        With a CDP endpoint configured, attaches a new context to the shared
+        Chromium behind it. Otherwise launches a persistent context so the
+        whole Chromium profile (cookies, cache, service workers) is reused
+        between runs, avoiding cold-start login round-trips.
+
         Returns:
             Page: The browser page object
         """
-        playwright = sync_playwright().start()
-        
-        # Create browser
-        self.browser = playwright.chromium.launch(headless=False)
-        
-        # Create or restore context with stored state
-        context_params = {}
-        if os.path.exists(self.storage_state_path):
-            context_params["storage_state"] = self.storage_state_path
-            
-        self.context = self.browser.new_context(**context_params)
-        self.page = self.context.new_page()
-        
+        self.playwright = await async_playwright().start()
+
+        if self.cdp_endpoint:
+            # Attach to the shared browser; one Chromium serves many scrapers
+            self.browser = await self.playwright.chromium.connect_over_cdp(self.cdp_endpoint)
+            self.context = await self.browser.new_context()
+        else:
+            # Launch against the on-disk profile instead of a fresh browser
+            self.context = await self.playwright.chromium.launch_persistent_context(
+                self.user_data_dir,
+                headless=False
+            )
+        self.page = self.context.pages[0] if self.context.pages else await self.context.new_page()
+
         return self.page
-    
+
     def save_state(self):
-        """Save the current browser state"""
-        if self.context:
-            self.context.storage_state(path=self.storage_state_path)
-    
-    def close(self):
-        """Close the browser and save state"""
+        """State lives in the user data dir; Chromium persists it itself"""
+        pass
+
+    async def close(self):
+        """Close the browser; the profile stays on disk for the next run"""
         try:
-            self.save_state()
-        finally:
             if self.page:
-                self.page.close()
+                await self.page.close()
+        finally:
             if self.context:
-                self.context.close()
+                await self.context.close()
             if self.browser:
-                self.browser.close()
+                # Disconnects from a shared browser without killing it
+                await self.browser.close()
+            if self.playwright:
+                await self.playwright.stop()
 
 # Example usage
-if __name__ == "__main__":
+async def _example():
     # Initialize the persistent browser
     browser_manager = PersistentBrowser()
-    
+
     try:
         # Start or restore the browser session
-        page = browser_manager.start()
-        
+        page = await browser_manager.start()
+
         # Navigate to a website
-        page.goto("https://www.linkedin.com")
-        
+        await page.goto("https://www.linkedin.com")
+
         # Do your work here...
-        # Save state periodically
-        browser_manager.save_state()
-        
+
     except Exception as e:
         print(f"An error occurred: {e}")
     finally:
-        # This will save state and close everything properly
-        browser_manager.close() 
\ No newline at end of file
+        # This will close everything properly; the profile persists
+        await browser_manager.close()
+
+if __name__ == "__main__":
+    asyncio.run(_example())